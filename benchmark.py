@@ -0,0 +1,110 @@
+# Libraries
+import argparse
+import csv
+import glob
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Pages are benchmarked against recorded fixtures, see the Offline Replay section of the README
+os.environ.setdefault('DATA_MODE', 'replay')
+
+from streamlit.testing.v1 import AppTest
+import charts
+import rollups
+
+# Global Variables
+root = os.path.dirname(os.path.abspath(__file__))
+intervals = ['Daily', 'Weekly', 'Monthly']
+
+# Benchmark
+def set_interval(at, interval):
+    for radio in at.radio:
+        if list(radio.options) == intervals:
+            radio.set_value(interval)
+
+def rerun(at):
+    start = time.perf_counter()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return time.perf_counter() - start
+
+# Tabs render lazily, each page opens them through its <name>_tab widget key
+def tab_key(page):
+    return os.path.basename(page)[:-len('.py')].split('_')[-1].lower() + '_tab'
+
+# Empties the process-wide figure and rollup caches the pages share, so the next rerun builds every chart again
+def clear_caches():
+    with charts.figures_lock:
+        charts.figures.clear()
+    with rollups.cache_lock:
+        rollups.cache.clear()
+
+# Cold reruns start from empty caches and count the figures they build, warm reruns are served from the caches
+def measure(at, interval, repeat):
+    rerun(at)
+    set_interval(at, interval)
+    rerun(at)
+    cold = []
+    for _ in range(repeat):
+        clear_caches()
+        cold.append(rerun(at))
+    built = len(charts.figures)
+    warm = [rerun(at) for _ in range(repeat)]
+
+    clear_caches()
+    tracemalloc.start()
+    rerun(at)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return built, statistics.median(cold) * 1000, statistics.median(warm) * 1000, peak / 2 ** 20
+
+# Renders a page once to load its data, then times reruns of every tab with every interval radio set to the interval
+def benchmark(page, interval, repeat, timeout):
+    at = AppTest.from_file(page, default_timeout=timeout)
+    rerun(at)
+    tabs = []
+    for label in [tab.label for tab in at.tabs] or ['-']:
+        if label != '-':
+            at.session_state[tab_key(page)] = label
+        tabs.append((label.strip('*'), *measure(at, interval, repeat)))
+    return {
+        'page': os.path.basename(page)[:-len('.py')],
+        'interval': interval,
+        'tabs': tabs,
+        'figures': sum(tab[1] for tab in tabs),
+        'cold_ms': sum(tab[2] for tab in tabs),
+        'warm_ms': sum(tab[3] for tab in tabs),
+        'peak_mib': max(tab[4] for tab in tabs),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless render benchmark of the dashboard pages')
+    parser.add_argument('pages', nargs='*', help='page scripts, all pages by default')
+    parser.add_argument('--repeat', type=int, default=3, help='timed cold and warm reruns per tab and interval')
+    parser.add_argument('--timeout', type=float, default=300, help='seconds allowed per script run')
+    parser.add_argument('--csv', help='also write one row per page, interval and tab to this file')
+    args = parser.parse_args()
+
+    os.chdir(root)
+    pages = [os.path.abspath(page) for page in args.pages] or sorted(glob.glob(os.path.join(root, 'pages', '*.py')))
+    rows = []
+    print(f"{'Page':<20} {'Interval':<8} {'Figures':>7} {'Cold [ms]':>10} {'Warm [ms]':>10} {'Peak [MiB]':>10}  Tabs")
+    for page in pages:
+        for interval in intervals:
+            result = benchmark(page, interval, args.repeat, args.timeout)
+            tabs = ', '.join(f'{tab}: {figures} ({cold:,.0f}/{warm:,.0f} ms)' for tab, figures, cold, warm, _ in result['tabs'])
+            print(f"{result['page']:<20} {interval:<8} {result['figures']:>7} {result['cold_ms']:>10,.0f} {result['warm_ms']:>10,.0f} {result['peak_mib']:>10,.1f}  {tabs}")
+            rows += [dict(result, tab=tab, tab_figures=figures, tab_cold_ms=cold, tab_warm_ms=warm, tab_peak_mib=peak) for tab, figures, cold, warm, peak in result['tabs']]
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, ['page', 'interval', 'tab', 'tab_figures', 'tab_cold_ms', 'tab_warm_ms', 'tab_peak_mib', 'figures', 'cold_ms', 'warm_ms', 'peak_mib'], extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# Libraries
+from collections import OrderedDict
+from contextlib import contextmanager
+import datetime
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from data import Unavailable
+
+# Global Variables
+max_figures = 256  # figures kept in memory across all pages and sessions
+max_points = 1000  # points per daily series sent to the browser, about the pixel width of a full-width chart
+
+# Figure Cache
+# A chart is identified by where its builder is defined and keyed by the data it is drawn from, frames by their
+# snapshot token (set by data.get_data and rollups) or otherwise their content, so reruns reuse unchanged figures
+figures = OrderedDict()  # (file, line, tokens) -> figure
+figures_lock = threading.Lock()
+
+def token(value):
+    if isinstance(value, pd.DataFrame):
+        if 'snapshot' in value.attrs:
+            return value.attrs['snapshot']
+        return tuple(value.columns), hashlib.sha1(pd.util.hash_pandas_object(value).to_numpy().tobytes()).hexdigest()
+    return value
+
+# Decorates a builder function and replaces it with the figure it returns, cached figures must not be modified
+def figure(*dependencies):
+    def build(function):
+        full_resolution = st.session_state.get('full_resolution', False)
+        key = (function.__code__.co_filename, function.__code__.co_firstlineno, full_resolution, *map(token, dependencies))
+        with figures_lock:
+            fig = figures.get(key)
+            if fig is not None:
+                figures.move_to_end(key)
+                return fig
+        fig = function()
+        if not full_resolution:
+            downsample(fig, max_points)
+        with figures_lock:
+            figures[key] = fig
+            while len(figures) > max_figures:
+                figures.popitem(last=False)
+        return fig
+    return build
+
+# Widget State
+# Widgets that are not rendered in a run (closed tabs, other pages) lose their state, so a widget uses _<key> and its
+# value is kept under <key>, from where it is restored the next time the widget is rendered. The default is seeded the
+# same way, a widget with a persisted key must not be given a value or index of its own
+def persist(key, default=None):
+    if '_' + key not in st.session_state:
+        if key in st.session_state:
+            st.session_state['_' + key] = st.session_state[key]
+        elif default is not None:
+            st.session_state['_' + key] = default
+    return {'key': '_' + key, 'on_change': lambda: st.session_state.update({key: st.session_state['_' + key]})}
+
+# Sections
+# Wraps the charts drawn from one dataset, if it could not be loaded they are replaced by an error and the rest of the
+# page still renders
+@contextmanager
+def section():
+    try:
+        yield
+    except Unavailable as error:
+        st.error(str(error), icon='⚠️')
+
+# Date Range
+# The window is shared by all pages through its date_range key
+launch = datetime.date(2021, 11, 11)  # Optimism regenesis, the start of every daily dataset
+
+def date_filter():
+    st.sidebar.date_input('**Date Range**', min_value=launch, max_value=datetime.date.today(), **persist('date_range', (launch, datetime.date.today())),
+        help='Window of the daily, weekly and monthly charts')
+
+# Downsampling
+# Long daily series are cut to max_points per trace: lines keep their shape through Largest-Triangle-Three-Buckets,
+# bars, stacked areas and unified-hover charts are averaged into time buckets shared by all traces so they stay aligned,
+# including the traces that are short enough on their own
+def resolution_toggle():
+    st.sidebar.toggle('**Full Resolution**', **persist('full_resolution'), help=f'Draw every daily point instead of at most {max_points:,} per series, for zooming into long histories')
+
+def lttb(x, y, n):
+    size = len(x)
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    selected = np.empty(n, dtype=int)
+    selected[0], selected[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        start, end, following = edges[i], edges[i + 1], edges[i + 2] if i + 3 < n else size
+        average_x, average_y = x[end:following].mean(), y[end:following].mean()
+        area = np.abs((x[a] - average_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (average_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def bucket(x, y, edges):
+    bins = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, len(edges) - 2)
+    valid = ~np.isnan(y)
+    sums = np.bincount(bins[valid], y[valid], len(edges) - 1)
+    counts = np.bincount(bins[valid], minlength=len(edges) - 1)
+    occupied, first = np.unique(bins, return_index=True)
+    with np.errstate(invalid='ignore'):
+        return first, edges[occupied], sums[occupied] / counts[occupied]
+
+def dates(trace):
+    if trace.x is None or trace.y is None:
+        return None
+    x = pd.Index(trace.x)
+    return x.to_numpy(dtype='datetime64[ns]').view('int64') if pd.api.types.is_datetime64_any_dtype(x) else None  # nanoseconds, whatever the unit of the frame
+
+def downsample(fig, n):
+    series = [(trace, x) for trace in fig.data if trace.type in ('scatter', 'scattergl', 'bar') and (x := dates(trace)) is not None]
+    if not any(len(x) > n for _, x in series):
+        return
+    start, end = min(x.min() for _, x in series), max(x.max() for _, x in series)
+    edges = np.linspace(start, end + 1, n + 1).astype('int64')
+    unified = fig.layout.hovermode == 'x unified'
+    for trace, x in series:
+        bucketed = trace.type == 'bar' or trace.type == 'scatter' and trace.stackgroup or unified
+        if len(x) <= n and not bucketed:
+            continue
+        y = np.asarray(trace.y, dtype=float)
+        if not bucketed:
+            order = np.argsort(x, kind='stable')
+            index = order[lttb(x[order].astype(float), np.nan_to_num(y[order]), n)]
+            trace.update(x=pd.to_datetime(x[index]), y=y[index])
+        else:
+            index, starts, means = bucket(x, y, edges)
+            trace.update(x=pd.to_datetime(starts).floor('D'), y=means)
+        for name in ('customdata', 'text', 'hovertext'):
+            values = trace[name]
+            if values is not None and not isinstance(values, str) and len(values) == len(x):
+                trace[name] = np.asarray(values)[index]
+
+# Share Charts
+# Pivots the frame once into a Date x category matrix and stacks one percent-normalized trace per category column
+def share_chart(df, category, metric, title):
+    matrix = df.pivot_table(index='Date', columns=category, values=metric, aggfunc='sum', observed=True)
+    fig = go.Figure()
+    for name in df[category].unique():
+        column = matrix[name]
+        present = column.notna().to_numpy()
+        fig.add_trace(go.Scatter(
+            name=name,
+            x=matrix.index[present],
+            y=column.to_numpy()[present],
+            mode='lines',
+            stackgroup='one',
+            groupnorm='percent'
+        ))
+    fig.update_layout(title=title)
+    return fig
+
+# Time Zones
+# Heatmaps are shifted by whole hours from UTC, the offset defaults to the viewer's browser and is shared by all pages
+# through its utc_offset key
+offsets = list(range(-12, 15))
+
+def timezone_select():
+    browser = -round((st.context.timezone_offset or 0) / 60)
+    return st.selectbox('**Time Zone**', offsets, **persist('utc_offset', browser if browser in offsets else 0),
+        format_func=lambda offset: f'UTC{offset:+03d}:00' if offset else 'UTC',
+        help='Hours of the heatmaps in this time zone, half-hour zones are rounded to the nearest hour')
+
+# Heatmaps
+# Draws a metric of a rollups.heatmap cube as its 7 x 24 matrix, the cube already holds the weekday order
+def heatmap_chart(df, metric, title):
+    days = df['Day'].unique()
+    fig = go.Figure(go.Heatmap(
+        x=list(range(24)),
+        y=days,
+        z=df[metric].to_numpy().reshape(len(days), 24),
+        coloraxis='coloraxis',
+        hovertemplate=f'Hour=%{{x}}<br>Day=%{{y}}<br>{metric}=%{{z:,.2f}}<extra></extra>'
+    ))
+    fig.update_layout(title=title)
+    return fig
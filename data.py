@@ -0,0 +1,442 @@
+# Libraries
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import array
+import io
+import logging
+import math
+import os
+import sys
+import threading
+import time
+import ijson
+import numpy as np
+import pandas as pd
+import requests
+import urllib3
+from packaging.version import Version
+from sketches import centroids, dense
+
+# Copy-on-Write, the default from pandas 3 and an option since pandas 1.5, so pages can only ever change their own view
+# of a cached frame
+if Version(pd.__version__) < Version('3'):
+    pd.set_option('mode.copy_on_write', True)
+
+# Global Variables
+api_url = 'https://api.flipsidecrypto.com/api/v2/queries/{}/data/latest'
+snapshot_dir = os.environ.get('SNAPSHOT_DIR', '.snapshots')
+fixture_dir = os.environ.get('FIXTURE_DIR', 'fixtures')
+data_mode = os.environ.get('DATA_MODE', 'live')  # live, record or replay
+logger = logging.getLogger(__name__)
+day = 24 * 60 * 60  # the Flipside queries re-run every 24 hours
+retry_after = 60  # seconds between background refresh attempts of a failing query
+trailing_days = 2  # days of a daily dataset re-read on every refresh to pick up late rows
+timeout = (3.05, 10)  # seconds to connect and between bytes of a response
+deadline = 30  # seconds a whole download may take, retries included
+workers = 16  # concurrent fetches, also the number of pooled connections
+
+# Query Registry
+@dataclass(frozen=True)
+class Query:
+    id: str
+    labels: tuple = ()  # categorical columns
+    dates: tuple = ()  # datetime columns
+    ttl: int = day  # seconds a fetched result stays fresh
+
+queries = {
+    # Macro
+    'Prices Overview': Query('6d1382f2-62fe-493e-8fec-73fb4923fe82'),
+    'Prices Daily': Query('7497aa52-9d5a-4f87-9181-3460b9454598', dates=('Date',)),
+    'Blocks Overview': Query('ae07b6ca-1ed1-4f33-9962-82248051615b'),
+    'Blocks Daily': Query('305b2656-bb71-4010-b8b5-8bba63251aa4', dates=('Date',)),
+    'Transactions Overview': Query('df60d653-c930-4c8b-923b-d4dfee9f22a9'),
+    'Transactions Daily': Query('f3765691-7645-4bf8-81a7-488730e7536e', dates=('Date',)),
+    'Transactions Heatmap': Query('656cd42b-7df3-492f-8046-6281fa027954', labels=('Day',)),
+    'Transactions Status Overview': Query('d38298c5-e2b8-46c7-8e1e-3df5e1b1cebe', labels=('Status',)),
+    'Transactions Status Daily': Query('caa89120-cdd2-4c04-8385-3a848a4d7f6c', labels=('Status',), dates=('Date',)),
+
+    # Governance
+    'Airdrops Overview': Query('c9975ac7-ff80-4727-9871-50854a4d09c4'),
+    'Airdrops Daily': Query('ed708971-8811-46cb-b905-414203330493', dates=('Date',)),
+    'Airdrops Holdings': Query('9a7e04a7-00e2-4326-a988-eecdc0de73a7', labels=('Status',)),
+    'Delegations Overview': Query('cc6eaf1d-b3db-4899-9ad9-16e1ca45bee4', labels=('Type',)),
+    'Delegations Daily': Query('5a09b40d-0002-40df-a895-0e1d27d8bc24', labels=('Type',), dates=('Date',)),
+    'Delegations Delegates': Query('e4db6425-591c-497d-95a9-59baf46c72b1', labels=('Delegate',)),
+
+    # Bridges
+    'Bridges Overview': Query('0eb7ce61-825c-4047-8845-6e56950f0c46'),
+    'Bridges Daily': Query('38b44e33-6817-4186-814d-423ca30a0470', dates=('Date',)),
+    'Bridges Protocols Overview': Query('d74f6b01-ad6e-42a5-a56a-f9d59b71fbcb', labels=('Protocol',)),
+    'Bridges Protocols Daily': Query('1fda50b0-f12a-4b8b-b5e4-48777a4a7801', labels=('Protocol',), dates=('Date',)),
+    'Bridges Tokens Overview': Query('13c6741f-4097-47f8-bacf-fec9f105ca6e', labels=('Token',)),
+    'Bridges Tokens Daily': Query('15172a48-0ee7-4926-b05d-d4bf579127d6', labels=('Token',), dates=('Date',)),
+
+    # Transfers
+    'Transfers Overview': Query('2f3542c9-b8ad-4afe-bc26-0b44af367a68'),
+    'Transfers Daily': Query('33352196-58e0-4961-b81a-c6565151fe88', dates=('Date',)),
+    'Transfers Heatmap': Query('43f04e4a-2a99-4c48-8782-ca9d60992550', labels=('Day',)),
+    'Transfers Distribution': Query('07882e18-f005-45a9-9c3f-56cc8e5e33f8', labels=('Bucket',)),
+    'Transfers Assets Overview': Query('f6d40379-b7da-4564-bd80-bfb2cd253ec1', labels=('Asset',)),
+    'Transfers Assets Daily': Query('5fe7d1df-c86c-485a-ae06-bac14d5357c5', labels=('Asset',), dates=('Date',)),
+
+    # CEXs
+    'CEXs Overview': Query('c6ce63a9-10ee-4014-9b37-2bbbce60b2f1', labels=('Flow',)),
+    'CEXs Exchanges Overview': Query('8dd08f28-00c4-48f0-a118-192af4f21009', labels=('Flow', 'CEX')),
+    'CEXs Exchanges Daily': Query('aa66293c-aa47-4e51-b1f1-37fb0a1a98a0', labels=('Flow', 'CEX'), dates=('Date',)),
+
+    # Swaps
+    'Swaps Overview': Query('380ce1a1-6421-44d4-a611-e92b1bf4f438'),
+    'Swaps Daily': Query('332d8e85-b52f-41a6-bcb7-055e56379ce3', dates=('Date',)),
+    'Swaps Heatmap': Query('8ea73033-2358-4298-a292-5cdf851a6b5f', labels=('Day',)),
+    'Swaps DEXs Overview': Query('7570a36e-1089-40ac-90a4-6eb84231083a', labels=('DEX',)),
+    'Swaps DEXs Daily': Query('f6271734-25ea-4057-9ffc-e9a3bd178056', labels=('DEX',), dates=('Date',)),
+    'Swaps Asset Types Overview': Query('89073788-30eb-4e58-9dd3-1321b99775f0', labels=('Type',)),
+    'Swaps Asset Types Daily': Query('e6115b75-131b-447d-8fd6-8b056457299f', labels=('Type',), dates=('Date',)),
+    'Swaps Assets Overview': Query('2c578e1a-0673-4b9a-bdec-c6244715b1c4', labels=('Asset',)),
+    'Swaps Assets Daily': Query('a8d2f8bb-e2b1-43e6-aeb8-efb34373421c', labels=('Asset',), dates=('Date',)),
+
+    # NFTs
+    'NFTs Overview': Query('c435d4b6-8e22-4486-8335-78d181ec0044'),
+    'NFTs Daily': Query('127df02b-c5c0-441d-90bd-ae6a22a911cb', dates=('Date',)),
+    'NFTs Heatmap': Query('4406b00a-59f8-45e4-a5c9-c615c3710494', labels=('Day',)),
+    'NFTs Marketplaces Overview': Query('e1ded0c5-2d1f-45a2-b98f-84c707babb03', labels=('Marketplace',)),
+    'NFTs Marketplaces Daily': Query('9b9dc5cf-b670-4642-a14a-51388c160cf3', labels=('Marketplace',), dates=('Date',)),
+    'NFTs Collections Overview': Query('5b6c218b-2627-47b3-ae6b-04208e63f2f8', labels=('Collection',)),
+    'NFTs Collections Daily': Query('8d67b4a4-e3ec-4371-9a3b-91efb485becc', labels=('Collection',), dates=('Date',)),
+}
+
+# Ingest
+# Results are shrunk once on arrival: labels become categoricals that already hold the 'Other' bucket, integers take the
+# smallest type holding their values (aggregations upcast again), floats become float32 only when that is lossless
+# and <Column>Sketch and <Column>Digest columns become HyperLogLog registers and t-digest centroids, daily datasets are
+# ordered by Date so date windows can be binary searched
+def normalize(query, frame):
+    schema = queries[query]
+    before = frame.memory_usage(deep=True).sum()
+    for column in frame.columns:
+        values = frame[column]
+        if column in schema.dates:
+            frame[column] = pd.to_datetime(values)
+        elif column.endswith('Sketch'):
+            frame[column] = values.map(dense)
+        elif column.endswith('Digest'):
+            frame[column] = values.map(centroids)
+        elif column in schema.labels:
+            frame[column] = pd.Categorical(values, categories=sorted(set(values.dropna().unique()) | {'Other'}, key=str))
+        elif pd.api.types.is_integer_dtype(values):
+            frame[column] = pd.to_numeric(values, downcast='integer')
+        elif pd.api.types.is_float_dtype(values) and values.astype('float32').astype(values.dtype).equals(values):
+            frame[column] = values.astype('float32')
+    if 'Date' in frame and 'Date' in schema.dates and not frame['Date'].is_monotonic_increasing:
+        frame = frame.sort_values('Date', kind='stable', ignore_index=True)
+    logger.info('Normalized %s from %.2f to %.2f MiB', query, before / 2 ** 20, frame.memory_usage(deep=True).sum() / 2 ** 20)
+    return frame
+
+# Snapshot Store
+# Query results are kept on disk as <snapshot_dir>/<query id>/<fetched at>.parquet so they survive restarts
+def read_snapshot(query):
+    folder = os.path.join(snapshot_dir, queries[query].id)
+    try:
+        fetched_at = max(int(file[:-len('.parquet')]) for file in os.listdir(folder) if file.endswith('.parquet'))
+    except (FileNotFoundError, ValueError):
+        return None
+    return normalize(query, pd.read_parquet(os.path.join(folder, f'{fetched_at}.parquet'))), fetched_at
+
+def write_snapshot(query, frame, fetched_at):
+    folder = os.path.join(snapshot_dir, queries[query].id)
+    path = os.path.join(folder, f'{fetched_at}.parquet')
+    try:
+        os.makedirs(folder, exist_ok=True)
+        frame.to_parquet(path + '.tmp')
+        os.replace(path + '.tmp', path)
+    except Exception:
+        logger.warning('Could not write snapshot of %s', query, exc_info=True)
+        return
+    for file in os.listdir(folder):
+        if file.endswith('.parquet') and file != os.path.basename(path):
+            os.remove(os.path.join(folder, file))
+
+# Data Sources
+# Module level, so every page and session in the process shares one copy of each dataset
+cache = {}  # query -> (frame, fetched_at)
+cache_lock = threading.Lock()
+pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='flipside')
+
+# HTTP Client
+# One keep-alive session shared by all threads, responses are gzip encoded and a refresh sends back the validators of
+# the last download, so a query result that did not change since costs a 304 instead of a body. Connection errors and
+# overloaded responses are retried twice with exponential backoff, a read timeout is not, and the body stops being read
+# deadline seconds after the request started, so a failing download gives up after at most about 40 s
+session = requests.Session()
+retries = urllib3.util.Retry(total=2, read=0, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False, respect_retry_after_header=False)
+session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=workers, max_retries=retries))
+validators = {}  # query -> conditional request headers matching the cached result
+conditions = {'ETag': 'If-None-Match', 'Last-Modified': 'If-Modified-Since'}
+
+# A response body that keeps trickling in faster than the read timeout still ends at the deadline
+class Deadline:
+    def __init__(self, stream, expires):
+        self.read1, self.expires = getattr(stream, 'read1', stream.read), expires
+
+    # Returns what arrived so far instead of waiting for size bytes, so the deadline is checked at every chunk
+    def read(self, size=-1):
+        if time.monotonic() > self.expires:
+            raise TimeoutError(f'Download not finished within {deadline} s')
+        return self.read1(size)
+
+# Returns the response and its body, the response has to be closed to give the connection back to the pool
+def request(query, conditional=False):
+    expires = time.monotonic() + deadline
+    response = session.get(api_url.format(queries[query].id), headers=validators.get(query, {}) if conditional else {}, stream=True, timeout=timeout)
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        response.close()
+        raise
+    response.raw.decode_content = True
+    return response, Deadline(response.raw, expires)
+
+def download(query):
+    response, body = request(query)
+    with response:
+        return b''.join(iter(lambda: body.read(2 ** 16), b''))
+
+# Fixtures
+# Raw query responses stored as <fixture_dir>/<query id>.json, recorded from and replayed instead of Flipside
+def fixture_path(query):
+    return os.path.join(fixture_dir, f'{queries[query].id}.json')
+
+def write_fixture(query, body):
+    os.makedirs(fixture_dir, exist_ok=True)
+    with open(fixture_path(query) + '.tmp', 'wb') as f:
+        f.write(body)
+    os.replace(fixture_path(query) + '.tmp', fixture_path(query))
+
+# Streaming Ingest
+# Responses are parsed record by record into one typed buffer per column, 64-bit integers until a fraction or null
+# shows up, then doubles, and lists for anything else, so the body and its records are never held in memory at once
+def append(buffer, value):
+    if isinstance(buffer, array.array):
+        if value is None or isinstance(value, float):
+            if buffer.typecode == 'q':
+                buffer = array.array('d', buffer)
+            buffer.append(math.nan if value is None else value)
+            return buffer
+        if isinstance(value, int) and not isinstance(value, bool):
+            try:
+                buffer.append(value)
+            except OverflowError:
+                buffer = array.array('d', buffer)
+                buffer.append(value)
+            return buffer
+        buffer = [None if math.isnan(item) else item for item in buffer]
+    buffer.append(value)
+    return buffer
+
+# Records dated before since (YYYY-MM-DD) are skipped
+def parse(stream, since=None):
+    columns = {}
+    rows = 0
+    for record in ijson.items(stream, 'item', use_float=True):
+        if since is not None and str(record.get('Date'))[:10] < since:
+            continue
+        for column, value in record.items():
+            buffer = columns.get(column)
+            if buffer is None:
+                buffer = array.array('d', [math.nan]) * rows if rows else array.array('q')
+            columns[column] = append(buffer, value)
+        rows += 1
+        if len(record) < len(columns):
+            for column, buffer in columns.items():
+                if len(buffer) < rows:
+                    columns[column] = append(buffer, None)
+    return pd.DataFrame({column: np.frombuffer(buffer, dtype=buffer.typecode) if isinstance(buffer, array.array) else buffer
+        for column, buffer in columns.items()})
+
+# Circuit Breaker
+# A query failing max_failures times in a row is not requested again for cooldown seconds, callers fail fast instead
+# and keep being served the snapshot they already have
+max_failures = 3
+cooldown = 5 * 60
+failures = {}  # query -> (consecutive failures, last failed at)
+
+def check_circuit(query):
+    count, failed_at = failures.get(query, (0, 0))
+    if count >= max_failures and time.time() - failed_at < cooldown:
+        raise ConnectionError(f'{query} failed {count} times in a row, not requested again for {cooldown - time.time() + failed_at:.0f} s')
+
+def record_failure(query):
+    with cache_lock:
+        failures[query] = (failures.get(query, (0, 0))[0] + 1, time.time())
+
+# Returns None when a conditional request found the cached result unchanged
+def fetch(query, since=None, conditional=False):
+    if data_mode == 'replay':
+        with open(fixture_path(query), 'rb') as f:
+            return normalize(query, parse(f, since))
+    check_circuit(query)
+    try:
+        if data_mode == 'record':
+            body = download(query)
+            write_fixture(query, body)
+            frame = normalize(query, parse(io.BytesIO(body), since))
+        else:
+            response, body = request(query, conditional)
+            with response:
+                if response.status_code == 304:
+                    frame = None
+                else:
+                    frame = normalize(query, parse(body, since))
+                    validators[query] = {condition: response.headers[header] for header, condition in conditions.items() if header in response.headers}
+    except Exception:
+        record_failure(query)
+        raise
+    failures.pop(query, None)
+    return frame
+
+# Incremental Refresh
+# Daily datasets keep their history and only take the rows from the high-water mark minus trailing_days on refresh
+def since(query, history):
+    if 'Date' not in queries[query].dates or history is None or history.empty:
+        return None
+    return (history['Date'].max() - pd.Timedelta(days=trailing_days)).strftime('%Y-%m-%d')
+
+def merge(query, history, recent, cutoff):
+    if recent.empty:
+        return history
+    frame = pd.concat([history[history['Date'] < pd.Timestamp(cutoff)], recent], ignore_index=True)
+    return normalize(query, frame)
+
+# Stale-While-Revalidate
+# Stale results keep being served while a background refresh downloads the new one and swaps it in
+refreshing = {}  # query -> started at
+checked = {}  # query -> last time the upstream result was found unchanged
+
+def refresh(query):
+    try:
+        history = cache[query][0] if query in cache else None
+        cutoff = since(query, history)
+        frame, fetched_at = fetch(query, cutoff, conditional=history is not None), int(time.time())
+        if frame is None:
+            with cache_lock:
+                checked[query] = time.time()
+                del refreshing[query]
+            return
+        if cutoff is not None:
+            frame = merge(query, history, frame, cutoff)
+        write_snapshot(query, frame, fetched_at)
+        with cache_lock:
+            cache[query] = (frame, fetched_at)
+            del refreshing[query]
+    except Exception:
+        validators.pop(query, None)
+        logger.warning('Could not refresh %s, serving the previous result', query, exc_info=True)
+
+def revalidate(query):
+    with cache_lock:
+        if time.time() - refreshing.get(query, 0) < retry_after:
+            return
+        refreshing[query] = time.time()
+    pool.submit(refresh, query)
+
+# Any snapshot is good enough to start serving, only a missing one blocks on the network. Record mode always downloads,
+# so every query the dashboard serves ends up in the fixtures
+def load(query):
+    if data_mode == 'replay':
+        return fetch(query), int(time.time())
+    snapshot = read_snapshot(query) if data_mode == 'live' else None
+    if snapshot is not None:
+        return snapshot
+    frame, fetched_at = fetch(query), int(time.time())
+    write_snapshot(query, frame, fetched_at)
+    return frame, fetched_at
+
+# Single Flight
+# Concurrent cache misses of a query share one load: the first caller runs it and the others wait on its future
+loading = {}  # query -> Future of (frame, fetched_at)
+
+def load_once(query):
+    with cache_lock:
+        if query in cache:
+            return cache[query]
+        future = loading.get(query)
+        if future is None:
+            future = loading[query] = Future()
+            leader = True
+        else:
+            leader = False
+    if not leader:
+        return future.result()
+    try:
+        entry = load(query)
+        with cache_lock:
+            cache[query] = entry
+    except BaseException as error:
+        future.set_exception(error)
+        raise
+    else:
+        future.set_result(entry)
+        return entry
+    finally:
+        with cache_lock:
+            del loading[query]
+
+# Errors
+# A query that could not be loaded is not loaded again for retry_after seconds, every caller in between gets the same
+# error at once instead of waiting on the network again
+class Unavailable(Exception):
+    pass
+
+unavailable = {}  # query -> (error, failed at) of the last failed load
+
+# Returns the cached (frame, fetched_at) of a query, fetched_at doubling as the version of the frame
+def get_entry(query):
+    if query not in queries:
+        raise KeyError(f'Unknown query {query!r}, see the queries registry in data.py')
+    entry = cache.get(query)
+    if entry is None:
+        error, failed_at = unavailable.get(query, (None, 0))
+        if time.time() - failed_at < retry_after:
+            raise Unavailable(f'{query} could not be loaded, try again in a minute') from error
+        try:
+            entry = load_once(query)
+        except Exception as error:
+            logger.warning('Could not load %s', query, exc_info=True)
+            unavailable[query] = (error, time.time())
+            raise Unavailable(f'{query} could not be loaded, try again in a minute') from error
+    if data_mode != 'replay' and time.time() - max(entry[1], checked.get(query, 0)) > queries[query].ttl:
+        revalidate(query)
+    return entry
+
+# Every caller gets its own shallow view of the shared frame, writes to it copy the touched columns only
+def get_data(query):
+    frame, fetched_at = get_entry(query)
+    view = frame.copy(deep=False)
+    view.attrs['snapshot'] = (query, fetched_at)
+    return view
+
+# Fetches all of a page's datasets at once, so a cold start waits on the slowest query only. A failing query does not
+# stop the others, its error is returned and raised again by the accessors of that query only (see charts.section)
+def prefetch(*names):
+    futures = {query: pool.submit(get_entry, query) for query in names}
+    errors = {}
+    for query, future in futures.items():
+        try:
+            future.result()
+        except Unavailable as error:
+            errors[query] = error
+    return errors
+
+# Records every registered query into the fixture directory: python data.py [fixture dir]
+def record_query(query):
+    write_fixture(query, download(query))
+
+def record():
+    for future in [pool.submit(record_query, query) for query in queries]:
+        future.result()
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        fixture_dir = sys.argv[1]
+    record()
+    print(f'Recorded {len(queries)} queries into {fixture_dir}')
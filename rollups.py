@@ -0,0 +1,153 @@
+# Libraries
+import threading
+import numpy as np
+import pandas as pd
+import streamlit as st
+from data import get_entry
+import sketches
+
+# Global Variables
+frequencies = {'Weekly': 'W', 'Monthly': 'MS'}
+max_rollups = 512  # derived frames kept in memory across all datasets, windows and sessions
+
+# Rollup Cache
+# Derived frames are computed once per dataset version, so switching an interval radio is a lookup
+cache = {}  # (query, fetched_at, ...) -> frame
+cache_lock = threading.Lock()
+
+def memoize(key, compute):
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        with cache_lock:
+            for stale in [k for k in cache if k[0] == key[0] and k[1] != key[1]]:
+                del cache[stale]
+            cache[key] = result
+            while len(cache) > max_rollups:
+                del cache[next(iter(cache))]
+    view = result.copy(deep=False)  # see get_data
+    view.attrs['snapshot'] = key
+    return view
+
+def freeze(spec):
+    return tuple(spec.items()) if isinstance(spec, dict) else spec
+
+# Date Range
+# Daily datasets are ordered by Date, so the window picked in the sidebar (see charts.date_filter) is cut out of the
+# cached frame by binary search and only that slice is aggregated
+def selected():
+    span = tuple(st.session_state.get('date_range', ()))
+    return span if len(span) == 2 else None
+
+def window(frame, span):
+    if span is None or 'Date' not in frame:
+        return frame
+    dates = frame['Date'].to_numpy()
+    start = dates.searchsorted(pd.Timestamp(span[0]).to_datetime64(), side='left')
+    end = dates.searchsorted((pd.Timestamp(span[1]) + pd.Timedelta(days=1)).to_datetime64(), side='left')
+    return frame.iloc[start:end]
+
+# Aggregators
+# Spec entries beyond pandas' own, each returns the columns it aggregated or None to use its pandas fallback
+def distinct(grouped, frame, column):
+    sketch = column + 'Sketch'
+    if sketch not in frame:
+        return None
+    merged = grouped[sketch].agg(sketches.merge)
+    return {column: merged.map(sketches.estimate), sketch: merged}
+
+# Percentiles read the <Column>Digest of e.g. AmountMedian or AmountP90 from the Amount stem of their column
+def percentile(q, suffix):
+    def aggregate(grouped, frame, column):
+        digest = column.removesuffix(suffix) + 'Digest'
+        if digest not in frame:
+            return None
+        merged = grouped[digest].agg(sketches.combine)
+        return {column: merged.map(lambda value: sketches.quantile(value, q)), digest: merged}
+    return aggregate
+
+aggregators = {  # name -> (function, fallback)
+    'distinct': (distinct, 'sum'),
+    'median': (percentile(0.5, 'Median'), 'mean'),
+    'p90': (percentile(0.9, 'P90'), 'mean'),
+    'p99': (percentile(0.99, 'P99'), 'mean'),
+}
+
+# Derived columns are recomputed from their aggregated operands rather than averaged across days,
+# ('ratio', numerator, denominator) divides two columns and ('weighted', weight) averages by a weight column
+def derive(frame, spec):
+    ratios, operands = {}, {}
+    for column, how in spec.items():
+        if isinstance(how, tuple) and how[0] == 'weighted':
+            frame = frame.assign(**{f'{column}*{how[1]}': frame[column] * frame[how[1]]})
+            how = ('ratio', f'{column}*{how[1]}', how[1])
+        if isinstance(how, tuple) and how[0] == 'ratio':
+            ratios[column] = how[1:]
+            operands.update({operand: 'sum' for operand in how[1:] if operand not in spec})
+    return frame, ratios, operands
+
+def summarize(frame, keys, spec):
+    if not isinstance(spec, dict):
+        return frame.groupby(keys, observed=True).agg(spec).reset_index()
+    frame, ratios, operands = derive(frame, spec)
+    reduced = {column: how for column, how in {**spec, **operands}.items() if column not in ratios}
+    grouped = frame.groupby(keys, observed=True)
+    custom = {}
+    for column, how in reduced.items():
+        if how in aggregators:
+            custom.update(aggregators[how][0](grouped, frame, column) or {})
+    plain = {column: aggregators[how][1] if how in aggregators else how for column, how in reduced.items() if column not in custom}
+    result = grouped.agg(plain) if plain else pd.DataFrame(index=grouped.size().index)
+    for column, values in custom.items():
+        result[column] = values
+    for column, (numerator, denominator) in ratios.items():
+        result[column] = result[numerator] / result[denominator].where(result[denominator] != 0)
+    extra = [column for column in [*operands, *custom] if column not in spec and '*' not in column]
+    return result[[*spec, *dict.fromkeys(extra)]].reset_index()
+
+def aggregate(frame, interval, spec, by):
+    if interval == 'Daily' and not by:
+        return frame
+    keys = ['Date' if interval == 'Daily' else pd.Grouper(freq=frequencies[interval], key='Date'), *by]
+    return summarize(frame, keys, spec)
+
+# Aggregates a daily dataset to the interval, optionally per label column(s) in by
+def rollup(query, interval, spec, by=()):
+    frame, fetched_at = get_entry(query)
+    by, span = (by,) if isinstance(by, str) else tuple(by), selected()
+    return memoize((query, fetched_at, interval, freeze(spec), by, span), lambda: aggregate(window(frame, span), interval, spec, by))
+
+# Top N
+# Rows ranked below n by metric within their period are folded into a single 'Other' row per period
+def bucket(frame, spec, by, n, metric):
+    labels = frame[by].astype('category')
+    dtype = pd.CategoricalDtype(sorted(set(labels.cat.categories) | {'Other'}))
+    top = labels.ne('Other') & (frame.groupby('Date')[metric].rank(method='max', ascending=False) <= n)
+    other = summarize(frame.loc[~top].drop(columns=by), 'Date', spec).assign(**{by: 'Other'})
+    result = pd.concat([frame.loc[top], other], ignore_index=True).astype({by: dtype})
+    return result.sort_values(['Date', by], ignore_index=True)
+
+def top_n(query, interval, spec, by, n=3, metric='Volume'):
+    frame, fetched_at = get_entry(query)
+    span = selected()
+    rolled = memoize((query, fetched_at, interval, freeze(spec), (by,), span), lambda: aggregate(window(frame, span), interval, spec, (by,)))
+    return memoize((query, fetched_at, interval, freeze(spec), (by,), span, n, metric), lambda: bucket(rolled, spec, by, n, metric))
+
+# Heatmaps
+# Weekday x hour datasets are averaged once per version into a UTC cube of every metric, rows ordered by days then hour,
+# other time zones roll the 168 hours of the week by their offset instead of binning again
+def cube(frame, days):
+    index = pd.MultiIndex.from_product([days, range(24)], names=['Day', 'Hour'])
+    frame = frame.astype({'Day': str, 'Hour': 'int64'})
+    metrics = [column for column in frame.select_dtypes('number') if column != 'Hour']
+    return frame.groupby(['Day', 'Hour'])[metrics].mean().reindex(index).reset_index()
+
+def shift(cube, offset):
+    metrics = cube.columns.drop(['Day', 'Hour'])
+    return cube.assign(**dict(zip(metrics, np.roll(cube[metrics].to_numpy(), offset, axis=0).T)))
+
+def heatmap(query, days, offset=0):
+    frame, fetched_at = get_entry(query)
+    days = tuple(days)
+    utc = memoize((query, fetched_at, 'Heatmap', days, 0), lambda: cube(frame, days))
+    return memoize((query, fetched_at, 'Heatmap', days, offset), lambda: shift(utc, offset)) if offset else utc
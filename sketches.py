@@ -0,0 +1,67 @@
+# Libraries
+import json
+import math
+import numpy as np
+
+# HyperLogLog
+# Distinct counts are merged from per-row HLL_EXPORT(HLL_ACCUMULATE(...)) sketches of the queries, which are kept as
+# bytes of their dense registers, so a weekly or monthly bucket counts an address once rather than once per day
+def dense(value):
+    if value is None or isinstance(value, bytes) or isinstance(value, float) and math.isnan(value):
+        return value if isinstance(value, bytes) else None
+    if isinstance(value, str):
+        value = json.loads(value)
+    registers = np.zeros(2 ** value.get('precision', 12), dtype=np.uint8)
+    if 'dense' in value:
+        registers[:] = value['dense']
+    else:
+        registers[value['sparse']['indices']] = value['sparse']['maxLzCounts']
+    return registers.tobytes()
+
+def merge(values):
+    registers = [np.frombuffer(value, dtype=np.uint8) for value in values if value is not None]
+    return np.maximum.reduce(registers).tobytes() if registers else None
+
+def estimate(value):
+    if value is None:
+        return math.nan
+    registers = np.frombuffer(value, dtype=np.uint8)
+    m = len(registers)
+    raw = 0.7213 / (1 + 1.079 / m) * m * m / np.exp2(-registers.astype(float)).sum()
+    zeros = np.count_nonzero(registers == 0)
+    return round(m * math.log(m / zeros) if raw <= 2.5 * m and zeros else raw)
+
+# t-digest
+# Percentiles are merged from per-row APPROX_PERCENTILE_ACCUMULATE(...) states of the queries, which are kept as
+# bytes of their (mean, weight) centroids, so a weekly or monthly median is read off the union of its days
+compression = 200
+
+def centroids(value):
+    if value is None or isinstance(value, bytes) or isinstance(value, float) and math.isnan(value):
+        return value if isinstance(value, bytes) else None
+    if isinstance(value, str):
+        value = json.loads(value)
+    state = np.asarray(value['state'] if isinstance(value, dict) else value, dtype=np.float64).reshape(-1, 2)
+    return state[np.argsort(state[:, 0], kind='stable')].tobytes()
+
+# Neighbouring centroids are pooled while they span at most one unit of the arcsine scale, which keeps centroids small
+# in the tails, so a percentile lands within a few tenths of a percentage point of its rank
+def combine(values):
+    states = [np.frombuffer(value, dtype=np.float64).reshape(-1, 2) for value in values if value is not None]
+    if not states:
+        return None
+    state = np.concatenate(states)
+    state = state[np.argsort(state[:, 0], kind='stable')]
+    weights = state[:, 1]
+    q = (np.cumsum(weights) - weights / 2) / weights.sum()
+    _, bins = np.unique(np.floor(compression / (2 * math.pi) * np.arcsin(2 * q - 1)), return_inverse=True)
+    pooled = np.bincount(bins, weights)
+    means = np.bincount(bins, state[:, 0] * weights) / pooled
+    return np.column_stack([means, pooled]).tobytes()
+
+def quantile(value, q):
+    if value is None:
+        return math.nan
+    state = np.frombuffer(value, dtype=np.float64).reshape(-1, 2)
+    weights = state[:, 1]
+    return float(np.interp(q * weights.sum(), np.cumsum(weights) - weights / 2, state[:, 0]))
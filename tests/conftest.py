@@ -0,0 +1,6 @@
+# Libraries
+import os
+import sys
+
+# Tests import the dashboard modules from the repository root, like the pages do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+# Libraries
+import datetime
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit.elements.lib.policies
+from streamlit.testing.v1 import AppTest
+from charts import downsample, launch
+
+# Downsampling
+def daily(days, unit):
+    return pd.date_range('2021-11-11', periods=days, unit=unit)
+
+def span(trace):
+    x = pd.to_datetime(pd.Index(trace.x))
+    return x.min(), x.max()
+
+def test_downsample_keeps_the_date_range_of_microsecond_dates():
+    df = pd.DataFrame({'Date': daily(1800, 'us'), 'Transactions': np.random.default_rng(0).random(1800)})
+    for fig in [px.line(df, x='Date', y='Transactions'), px.bar(df, x='Date', y='Transactions')]:
+        downsample(fig, 1000)
+        start, end = span(fig.data[0])
+        assert len(fig.data[0].x) <= 1000
+        assert df['Date'].min() <= start and end <= df['Date'].max()
+        assert start - df['Date'].min() < pd.Timedelta(days=2) and df['Date'].max() - end < pd.Timedelta(days=3)
+
+def test_downsample_aligns_short_traces_with_bucketed_ones():
+    dates = daily(1800, 'ns')
+    fig = go.Figure([go.Bar(x=dates, y=np.ones(1800)), go.Bar(x=dates[-500:], y=np.ones(500))])
+    fig.update_layout(barmode='stack')
+    downsample(fig, 1000)
+    long, short = (set(pd.to_datetime(pd.Index(trace.x))) for trace in fig.data)
+    assert short <= long
+    assert len(fig.data[1].x) < 500
+
+def test_downsample_leaves_short_figures_alone():
+    dates = daily(700, 'us')
+    fig = px.line(pd.DataFrame({'Date': dates, 'Users': np.arange(700)}), x='Date', y='Users')
+    downsample(fig, 1000)
+    assert len(fig.data[0].x) == 700
+
+# Widget State
+# The sidebar widgets of a page are not rendered while another page is open, which drops their widget state
+def sidebar():
+    import streamlit as st
+    from charts import date_filter, resolution_toggle, timezone_select
+    if st.session_state.get('rendered', True):
+        resolution_toggle()
+        date_filter()
+        timezone_select()
+
+def test_full_resolution_survives_a_run_without_its_toggle():
+    at = AppTest.from_function(sidebar)
+    at.run()
+    at.toggle[0].set_value(True).run()
+    at.session_state['rendered'] = False
+    at.run().run()
+    at.session_state['rendered'] = True
+    at.run()
+    assert at.toggle[0].value and at.session_state['full_resolution']
+
+def test_persisted_widgets_restore_without_session_state_warnings(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(streamlit.elements.lib.policies._LOGGER, 'warning', lambda *args, **kwargs: warnings.append(args))
+    at = AppTest.from_function(sidebar)
+    at.run()
+    assert at.date_input[0].value == (launch, datetime.date.today()) and at.selectbox[0].value == 0
+    at.date_input[0].set_value((datetime.date(2023, 1, 1), datetime.date(2023, 2, 1))).run()
+    at.selectbox[0].set_value(3).run()
+    at.session_state['rendered'] = False
+    at.run().run()
+    at.session_state['rendered'] = True
+    at.run()
+    assert at.date_input[0].value == (datetime.date(2023, 1, 1), datetime.date(2023, 2, 1)) and at.selectbox[0].value == 3
+    assert warnings == []
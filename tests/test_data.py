@@ -0,0 +1,121 @@
+# Libraries
+import http.server
+import json
+import os
+import threading
+import time
+import pandas as pd
+import pytest
+import requests
+import data
+import sketches
+from test_sketches import digest, export
+
+# Incremental Refresh
+@pytest.fixture
+def replay(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, 'data_mode', 'replay')
+    monkeypatch.setattr(data, 'fixture_dir', str(tmp_path / 'fixtures'))
+    monkeypatch.setattr(data, 'snapshot_dir', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(data, 'cache', {})
+    monkeypatch.setattr(data, 'refreshing', {})
+    monkeypatch.setattr(data, 'unavailable', {})
+    records = [{'Date': f'2024-01-{day:02d} 00:00:00.000', 'Transactions': day, 'Users': 10 * day} for day in range(1, 11)]
+    data.write_fixture('Transactions Daily', json.dumps(records).encode())
+
+def test_empty_incremental_response_keeps_the_history(replay):
+    history = data.fetch('Transactions Daily')
+    recent = data.fetch('Transactions Daily', since='2024-02-01')
+    assert recent.empty
+    assert data.merge('Transactions Daily', history, recent, '2024-02-01') is history
+
+def test_refresh_without_new_rows_settles(replay):
+    history = data.fetch('Transactions Daily')
+    data.cache['Transactions Daily'] = (history, 0)
+    data.refreshing['Transactions Daily'] = 0
+    records = [{'Date': '2023-12-01 00:00:00.000', 'Transactions': 1, 'Users': 1}]
+    data.write_fixture('Transactions Daily', json.dumps(records).encode())
+    data.refresh('Transactions Daily')
+    frame, fetched_at = data.cache['Transactions Daily']
+    assert 'Transactions Daily' not in data.refreshing
+    pd.testing.assert_frame_equal(frame, history)
+    assert fetched_at > 0
+
+def test_record_mode_downloads_past_a_snapshot(replay, monkeypatch):
+    history = data.fetch('Transactions Daily')
+    data.write_snapshot('Transactions Daily', history.head(1), 0)
+    body = open(data.fixture_path('Transactions Daily'), 'rb').read()
+    monkeypatch.setattr(data, 'data_mode', 'record')
+    monkeypatch.setattr(data, 'fixture_dir', data.fixture_dir + '-recorded')
+    monkeypatch.setattr(data, 'download', lambda query: body)
+    frame, fetched_at = data.load('Transactions Daily')
+    pd.testing.assert_frame_equal(frame, history)
+    assert os.path.exists(data.fixture_path('Transactions Daily'))
+
+def test_snapshots_keep_sketches_and_digests(replay):
+    frame = data.normalize('Transfers Daily', pd.DataFrame({'Date': ['2024-01-01', '2024-01-02'], 'UsersSketch': [export(range(10)), None],
+        'AmountDigest': [digest([1.0, 2.0, 3.0]), '{"state": [5, 2]}']}))
+    data.write_snapshot('Transfers Daily', frame, 1)
+    snapshot, fetched_at = data.read_snapshot('Transfers Daily')
+    pd.testing.assert_frame_equal(snapshot, frame)
+    assert isinstance(snapshot['UsersSketch'][0], bytes) and snapshot['UsersSketch'][1] is None
+    assert sketches.quantile(snapshot['AmountDigest'][0], 0.5) == 2 and sketches.quantile(snapshot['AmountDigest'][1], 0.5) == 5
+
+# Errors
+def test_prefetch_keeps_loading_past_a_failing_query(replay, monkeypatch):
+    errors = data.prefetch('Blocks Daily', 'Transactions Daily')
+    assert list(errors) == ['Blocks Daily']
+    assert 'Transactions Daily' in data.cache
+    monkeypatch.setattr(data, 'load', lambda query: pytest.fail(f'{query} loaded again'))
+    with pytest.raises(data.Unavailable):
+        data.get_data('Blocks Daily')
+
+# HTTP Client
+class Upstream(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.endswith('/missing'):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.end_headers()
+        if self.path.endswith('/complete'):
+            self.wfile.write(json.dumps([{'Date': f'2024-01-{day:02d} 00:00:00.000', 'Transactions': day} for day in range(1, 11)]).encode())
+            return
+        self.wfile.write(b'[')
+        for day in range(1, 100):
+            self.wfile.write(json.dumps({'Date': '2024-01-01 00:00:00.000', 'Transactions': day}).encode() + b',')
+            self.wfile.flush()
+            time.sleep(0.1)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def upstream(monkeypatch):
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Upstream)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(data, 'api_url', f'http://127.0.0.1:{server.server_port}/{{}}')
+    monkeypatch.setitem(data.session.adapters, 'http://', data.session.get_adapter('https://'))
+    monkeypatch.setattr(data, 'failures', {})
+    yield server
+    server.shutdown()
+
+def test_trickling_download_ends_at_the_deadline(upstream, monkeypatch):
+    monkeypatch.setattr(data, 'deadline', 1)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        data.fetch('Transactions Daily')
+    assert time.monotonic() - started < 3
+
+def test_download_reads_the_whole_body(upstream, monkeypatch):
+    monkeypatch.setitem(data.queries, 'Complete', data.Query('complete', dates=('Date',)))
+    frame = data.fetch('Complete')
+    assert frame['Transactions'].tolist() == list(range(1, 11))
+    assert json.loads(data.download('Complete'))[-1]['Transactions'] == 10
+
+def test_failed_request_closes_the_response(upstream, monkeypatch):
+    monkeypatch.setitem(data.queries, 'Missing', data.Query('missing'))
+    with pytest.raises(requests.HTTPError) as error:
+        data.request('Missing')
+    assert error.value.response.raw.closed
@@ -0,0 +1,37 @@
+# Libraries
+import datetime
+import glob
+import os
+import pytest
+from streamlit.testing.v1 import AppTest
+import charts
+import data
+
+# Pages
+# Rendered from the recorded responses in FIXTURE_DIR (python data.py), every tab opened in turn
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+pages = sorted(glob.glob(os.path.join(root, 'pages', '*.py')))
+
+@pytest.fixture
+def replay(monkeypatch):
+    if not all(os.path.exists(data.fixture_path(query)) for query in data.queries):
+        pytest.skip(f'No recorded responses in {data.fixture_dir}')
+    monkeypatch.setattr(data, 'data_mode', 'replay')
+    monkeypatch.chdir(root)
+
+def render(page, date_range):
+    at = AppTest.from_file(page, default_timeout=120)
+    at.session_state['date_range'] = date_range
+    at.run()
+    exceptions = [exception.value for exception in at.exception]
+    key = os.path.basename(page)[:-3].split('_')[-1].lower() + '_tab'
+    for tab in [tab.label for tab in at.tabs[1:]]:
+        at.session_state[key] = tab
+        at.run()
+        exceptions += [exception.value for exception in at.exception]
+    return exceptions
+
+@pytest.mark.parametrize('date_range', [(datetime.date.today(), datetime.date.today()), (charts.launch, charts.launch + datetime.timedelta(days=1))])
+@pytest.mark.parametrize('page', pages, ids=os.path.basename)
+def test_page_renders_an_empty_window(replay, page, date_range):
+    assert render(page, date_range) == []
@@ -0,0 +1,47 @@
+# Libraries
+import numpy as np
+import pandas as pd
+import data
+import rollups
+from test_sketches import digest, export
+
+# Aggregators
+# Daily rows are normalized like a query result, so their sketches go through ingest as well
+dates = pd.date_range('2024-01-01', periods=28)  # four whole weeks, Monday to Sunday
+
+def users(day, dex=0):
+    return set(range(day * 200 + dex * 300, day * 200 + dex * 300 + 1000))
+
+def week(end):
+    return [day for day, date in enumerate(dates) if end - pd.Timedelta(days=7) < date <= end]
+
+def test_weekly_distinct_counts_addresses_once():
+    frame = data.normalize('Transactions Daily', pd.DataFrame({'Date': dates.strftime('%Y-%m-%d'),
+        'Users': [len(users(day)) for day in range(len(dates))], 'UsersSketch': [export(users(day)) for day in range(len(dates))]}))
+    weekly = rollups.aggregate(frame, 'Weekly', {'Users': 'distinct'}, ())
+    assert len(weekly) == 4
+    for end, estimate in zip(weekly['Date'], weekly['Users']):
+        exact = len(set().union(*(users(day) for day in week(end))))
+        assert abs(estimate - exact) / exact < 0.03
+
+def test_top_n_other_counts_addresses_once():
+    rows = [{'Date': date.strftime('%Y-%m-%d'), 'DEX': f'DEX {dex}', 'Volume': 10 ** (5 - dex), 'Users': len(users(day, dex)), 'UsersSketch': export(users(day, dex))}
+        for day, date in enumerate(dates) for dex in range(5)]
+    frame = data.normalize('Swaps DEXs Daily', pd.DataFrame(rows))
+    spec = {'Volume': 'sum', 'Users': 'distinct'}
+    weekly = rollups.bucket(rollups.aggregate(frame, 'Weekly', spec, ('DEX',)), spec, 'DEX', 2, 'Volume')
+    other = weekly[weekly['DEX'] == 'Other']
+    assert len(other) == 4
+    for end, estimate in zip(other['Date'], other['Users']):
+        exact = len(set().union(*(users(day, dex) for day in week(end) for dex in range(2, 5))))
+        assert abs(estimate - exact) / exact < 0.03
+
+def test_weekly_percentiles_merge_the_daily_digests():
+    amounts = np.random.default_rng(0).lognormal(3, 1.5, size=(len(dates), 2000))
+    frame = data.normalize('Transfers Daily', pd.DataFrame({'Date': dates.strftime('%Y-%m-%d'), 'AmountMedian': np.median(amounts, axis=1),
+        'AmountDigest': [digest(day) for day in amounts]}))
+    weekly = rollups.aggregate(frame, 'Weekly', {'AmountMedian': 'median', 'AmountP90': 'p90', 'AmountP99': 'p99'}, ())
+    for end, row in weekly.set_index('Date').iterrows():
+        values = amounts[week(end)]
+        for column, q in [('AmountMedian', 0.5), ('AmountP90', 0.9), ('AmountP99', 0.99)]:
+            assert abs((values <= row[column]).mean() - q) < 0.003
@@ -0,0 +1,59 @@
+# Libraries
+import hashlib
+import json
+import math
+import numpy as np
+import sketches
+
+# HyperLogLog
+# Registers built the way HLL_ACCUMULATE does: the top precision bits of a 64-bit hash pick the register, which keeps
+# the largest position of the first set bit among the remaining ones
+def registers(addresses, precision=12):
+    values = np.zeros(2 ** precision, dtype=np.uint8)
+    for address in addresses:
+        h = int.from_bytes(hashlib.sha1(str(address).encode()).digest()[:8], 'big')
+        index, rest = h >> (64 - precision), h & (1 << (64 - precision)) - 1
+        values[index] = max(values[index], 64 - precision - rest.bit_length() + 1)
+    return values
+
+def export(addresses, sparse=False):
+    values = registers(addresses)
+    if sparse:
+        indices = np.flatnonzero(values)
+        return json.dumps({'version': 4, 'precision': 12, 'sparse': {'indices': indices.tolist(), 'maxLzCounts': values[indices].tolist()}})
+    return json.dumps({'version': 4, 'precision': 12, 'dense': values.tolist()})
+
+def test_dense_decodes_both_export_forms():
+    addresses = range(100)
+    assert sketches.dense(export(addresses)) == sketches.dense(export(addresses, sparse=True)) == registers(addresses).tobytes()
+    assert sketches.dense(json.loads(export(addresses))) == registers(addresses).tobytes()
+    assert sketches.dense(None) is None and sketches.dense(math.nan) is None
+    assert sketches.dense(b'\x01\x02') == b'\x01\x02'
+
+def test_estimate_counts_the_union_of_merged_sketches():
+    days = [sketches.dense(export(range(day * 1000, day * 1000 + 5000))) for day in range(7)]
+    assert abs(sketches.estimate(sketches.merge(days)) - 11000) / 11000 < 0.03
+    assert sketches.estimate(sketches.dense(export(range(50)))) == 50
+    assert sketches.merge([None]) is None and math.isnan(sketches.estimate(None))
+
+# t-digest
+# States exported like APPROX_PERCENTILE_EXPORT, (mean, weight) pairs flattened, here compressed from the raw amounts
+def digest(amounts):
+    state = sketches.combine([np.column_stack([amounts, np.ones(len(amounts))]).tobytes()])
+    return json.dumps({'version': 1, 'state': np.frombuffer(state).tolist()})
+
+def test_centroids_decode_sorted_by_mean():
+    state = np.frombuffer(sketches.centroids('{"state": [3, 1, 1, 2, 2, 1]}')).reshape(-1, 2)
+    assert state.tolist() == [[1, 2], [2, 1], [3, 1]]
+    assert sketches.centroids([3, 1, 1, 2]) == sketches.centroids({'state': [3, 1, 1, 2]})
+    assert sketches.centroids(None) is None and sketches.centroids(math.nan) is None
+
+# Accurate in rank throughout, values deep in a heavy tail move fast between neighbouring centroids
+def test_quantiles_of_combined_digests_match_the_exact_ones():
+    amounts = np.random.default_rng(0).lognormal(3, 1.5, size=(7, 5000))
+    merged = sketches.combine([sketches.centroids(digest(day)) for day in amounts])
+    assert len(merged) <= sketches.compression * 16
+    for q in [0.5, 0.9, 0.99]:
+        estimate, exact = sketches.quantile(merged, q), np.quantile(amounts, q)
+        assert abs((amounts <= estimate).mean() - q) < 0.003
+        assert abs(estimate - exact) / exact < (0.01 if q < 0.99 else 0.03)